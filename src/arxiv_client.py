@@ -2,23 +2,27 @@
 
 from __future__ import annotations
 
+import io
 import logging
 import re
 import time
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import feedparser
 import requests
-from dateutil.parser import parse as parse_date
 
 from config import (
     ARXIV_API_URL,
     ARXIV_CATEGORIES,
     FETCH_HOURS,
-    KEYWORD_PATTERNS,
+    KEYWORD_SCANNER,
+    KEYWORD_SEARCHES,
+    KEYWORD_STANDALONE,
     MAX_RESULTS,
 )
+from feed_stream import parse_atom, parse_timestamp
+from http_session import SESSION
 
 logger = logging.getLogger(__name__)
 
@@ -40,38 +44,42 @@ def _extract_arxiv_id(entry: dict[str, Any]) -> str:
 
 def _extract_categories(entry: dict[str, Any]) -> list[str]:
     """Extract category terms from an entry."""
-    tags = entry.get("tags", [])
-    return [t.get("term", "") for t in tags if t.get("term")]
+    return [t["term"] for t in entry.get("tags", ()) if t.get("term")]
 
 
 def _extract_authors(entry: dict[str, Any]) -> list[str]:
     """Extract author names from an entry."""
-    authors = entry.get("authors", [])
-    return [a.get("name", "") for a in authors if a.get("name")]
+    return [a["name"] for a in entry.get("authors", ()) if a.get("name")]
 
 
 def _extract_link(entry: dict[str, Any]) -> str:
     """Extract the HTML link for the paper."""
-    links = entry.get("links", [])
-    for link in links:
+    first: dict[str, Any] | None = None
+    for link in entry.get("links", ()):
         if link.get("type") == "text/html":
             return link.get("href", "")
+        if first is None:
+            first = link
     # Fallback to first link or id
-    if links:
-        return links[0].get("href", "")
+    if first is not None:
+        return first.get("href", "")
     return entry.get("id", "")
 
 
-def _match_keywords(title: str, summary: str, authors: list[str]) -> list[str]:
-    """Return list of matched company keywords using regex word boundaries."""
-    combined = f"{title} {summary} {' '.join(authors)}"
-    matched = []
-    seen: set[str] = set()
-    for display, pattern in KEYWORD_PATTERNS:
-        if display not in seen and pattern.search(combined):
-            matched.append(display)
-            seen.add(display)
-    return matched
+def _match_keywords(haystack: str) -> list[str]:
+    """Return list of matched company keywords using regex word boundaries.
+
+    ``haystack`` is the paper's title, summary and author names joined by
+    spaces. One scan of the combined keyword regex rules out the common
+    no-hit case; when it does hit, every keyword is searched individually so
+    overlapping keywords are all reported. Results follow the configured
+    keyword order, deduplicated by display name.
+    """
+    if KEYWORD_SCANNER is not None and KEYWORD_SCANNER.search(haystack) is None:
+        candidates = KEYWORD_STANDALONE
+    else:
+        candidates = KEYWORD_SEARCHES
+    return list(dict.fromkeys(display for display, search in candidates if search(haystack)))
 
 
 def _build_query() -> str:
@@ -80,16 +88,16 @@ def _build_query() -> str:
     return "+OR+".join(cat_parts)
 
 
-def _fetch_feed(url: str) -> feedparser.FeedParserDict:
+def _fetch_feed(url: str) -> list[dict[str, Any]]:
     """Fetch the arXiv Atom feed with retries on transient failures.
 
-    Uses ``requests`` for HTTP-level error handling, then passes the
-    response body to ``feedparser`` for XML parsing.
+    Uses ``requests`` for HTTP-level error handling, then streams the
+    response body through ``feed_stream.parse_atom`` for XML parsing.
     """
     last_exc: Exception | None = None
     for attempt in range(1, _MAX_RETRIES + 1):
         try:
-            resp = requests.get(url, timeout=30)
+            resp = SESSION.get(url, timeout=30)
             resp.raise_for_status()
         except requests.RequestException as exc:
             last_exc = exc
@@ -111,20 +119,28 @@ def _fetch_feed(url: str) -> feedparser.FeedParserDict:
                 time.sleep(delay)
             continue
 
-        feed = feedparser.parse(resp.text)
-        if feed.bozo and not feed.entries:
-            last_exc = RuntimeError(
-                f"arXiv API returned malformed feed: {feed.bozo_exception}"
-            )
+        entries: list[dict[str, Any]] = []
+        try:
+            for entry in parse_atom(io.BytesIO(resp.content)):
+                entries.append(entry)
+        except ET.ParseError as exc:
+            if entries:
+                # Same as feedparser's bozo-with-entries case: keep what parsed
+                logger.warning(
+                    "arXiv API response truncated after %d entries: %s",
+                    len(entries), exc,
+                )
+                return entries
+            last_exc = RuntimeError(f"arXiv API returned malformed feed: {exc}")
             logger.warning(
                 "arXiv API returned unparseable response (attempt %d/%d): %s",
-                attempt, _MAX_RETRIES, feed.bozo_exception,
+                attempt, _MAX_RETRIES, exc,
             )
             if attempt < _MAX_RETRIES:
                 time.sleep(_RETRY_DELAY_SECONDS * attempt)
             continue
 
-        return feed
+        return entries
 
     raise RuntimeError(
         f"arXiv API failed after {_MAX_RETRIES} attempts: {last_exc}"
@@ -140,31 +156,30 @@ def fetch_recent_papers() -> list[dict[str, Any]]:
     query = _build_query()
     url = f"{ARXIV_API_URL}?search_query={query}&sortBy=submittedDate&sortOrder=descending&max_results={MAX_RESULTS}"
 
-    feed = _fetch_feed(url)
+    entries = _fetch_feed(url)
 
     cutoff = datetime.now(timezone.utc) - timedelta(hours=FETCH_HOURS)
     results: list[dict[str, Any]] = []
 
-    for entry in feed.entries:
+    for entry in entries:
         # Parse published date
         published_str = entry.get("published", "")
         if not published_str:
             continue
         try:
-            published = parse_date(published_str)
+            published = parse_timestamp(published_str)
         except (ValueError, OverflowError):
             continue
 
-        if published.tzinfo is None:
-            published = published.replace(tzinfo=timezone.utc)
-
         if published < cutoff:
             continue
 
         title = entry.get("title", "").replace("\n", " ").strip()
         summary = entry.get("summary", "").replace("\n", " ").strip()
+        # Authors must stay in the haystack: collaboration papers credited to
+        # an organisation (e.g. an author named "OpenAI") only match there.
         authors = _extract_authors(entry)
-        matched = _match_keywords(title, summary, authors)
+        matched = _match_keywords(" ".join((title, summary, *authors)))
 
         if not matched:
             continue
@@ -182,7 +197,4 @@ def fetch_recent_papers() -> list[dict[str, Any]]:
             }
         )
 
-    # Be polite to arXiv API
-    time.sleep(1)
-
     return results
@@ -2,7 +2,8 @@
 
 import os
 import re
-from datetime import timedelta, timezone
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import yaml
@@ -10,8 +11,10 @@ from dotenv import load_dotenv
 
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-# Load .env from project root (parent of src/)
-load_dotenv(_PROJECT_ROOT / ".env")
+# Load .env from project root (parent of src/); absent in GitHub Actions
+_DOTENV_PATH = _PROJECT_ROOT / ".env"
+if _DOTENV_PATH.exists():
+    load_dotenv(_DOTENV_PATH)
 
 # arXiv API
 ARXIV_API_URL = "https://export.arxiv.org/api/query"
@@ -25,6 +28,11 @@ SLACK_CHANNEL_ID = os.environ.get("SLACK_CHANNEL_ID", "")
 # Output directory for generated briefing files (Markdown / PDF)
 OUT_DIR = _PROJECT_ROOT / "out"
 
+# Briefing attachments: "pdf" uploads Markdown + PDF, "md" uploads Markdown
+# only and skips the xhtml2pdf render entirely. Validated by brief mode only,
+# so a bad value never stops collect runs.
+BRIEFING_FORMAT = os.environ.get("BRIEFING_FORMAT", "").strip().lower() or "pdf"
+
 # State file
 STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "state.json")
 
@@ -32,6 +40,9 @@ STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "state.jso
 MAX_AUTHORS_DISPLAY = 6
 MAX_SUMMARY_LENGTH = 600
 
+# Hard cap on stored arXiv IDs; oldest entries are evicted first
+MAX_NOTIFIED_IDS = 50_000
+
 # Blog state retention (days)
 BLOG_RETENTION_DAYS = 30
 
@@ -42,6 +53,11 @@ BUFFER_RETENTION_DAYS = 3
 JST = timezone(timedelta(hours=9))
 
 
+def today_jst() -> str:
+    """Return today's date in JST as YYYY-MM-DD."""
+    return datetime.now(JST).date().isoformat()
+
+
 # ---------------------------------------------------------------------------
 # Tracking config: loaded from config.yml (falls back to hardcoded defaults)
 # ---------------------------------------------------------------------------
@@ -67,6 +83,10 @@ _DEFAULT_KEYWORDS: list[tuple[str, re.Pattern[str]]] = [
 ]
 
 
+# Pre-bound ``re.Pattern.search`` of a standalone keyword pattern
+_SearchFn = Callable[[str], re.Match[str] | None]
+
+
 def _compile_keywords(raw: list[dict]) -> list[tuple[str, re.Pattern[str]]]:
     """Compile keyword entries from config YAML into (display_name, pattern) tuples.
 
@@ -100,6 +120,40 @@ def _compile_keywords(raw: list[dict]) -> list[tuple[str, re.Pattern[str]]]:
     return result
 
 
+def _build_keyword_scanner(
+    keywords: list[tuple[str, re.Pattern[str]]],
+) -> tuple[re.Pattern[str] | None, list[tuple[str, _SearchFn]]]:
+    """Fold keyword patterns into a single alternation regex used as a prefilter.
+
+    Each embeddable pattern becomes one branch with its own case-sensitivity
+    scope, so one ``search`` tells whether *any* of them can match. The
+    scanner only answers "is there a hit at all": an alternation cannot
+    report overlapping matches (``Google`` vs ``Google DeepMind``), so the
+    exact keyword set is still taken from the per-pattern searches.
+
+    Returns ``(scanner, standalone)`` where ``standalone`` lists
+    ``(display, pattern.search)`` pairs (method pre-bound) for raw regexes
+    that cannot be embedded (capturing groups, backreferences or global
+    inline flags) and must always be searched on their own.
+    """
+    branches: list[str] = []
+    standalone: list[tuple[str, _SearchFn]] = []
+    for display, pattern in keywords:
+        scope = "(?i:" if pattern.flags & re.IGNORECASE else "(?:"
+        branch = f"{scope}{pattern.pattern})"
+        try:
+            embeddable = pattern.groups == 0 and re.compile(branch).groups == 0
+        except re.error:
+            embeddable = False
+        if embeddable:
+            branches.append(branch)
+        else:
+            standalone.append((display, pattern.search))
+
+    scanner = re.compile("|".join(branches)) if branches else None
+    return scanner, standalone
+
+
 def _load_tracking_config() -> (
     tuple[list[str], dict[str, str], dict[str, str], list[tuple[str, re.Pattern[str]]]]
 ):
@@ -166,3 +220,7 @@ def _load_tracking_config() -> (
 
 
 ARXIV_CATEGORIES, BLOG_FEEDS, SAFETY_FEEDS, KEYWORD_PATTERNS = _load_tracking_config()
+KEYWORD_SEARCHES: list[tuple[str, _SearchFn]] = [
+    (display, pattern.search) for display, pattern in KEYWORD_PATTERNS
+]
+KEYWORD_SCANNER, KEYWORD_STANDALONE = _build_keyword_scanner(KEYWORD_PATTERNS)
@@ -0,0 +1,91 @@
+"""Streaming Atom parser for arXiv API responses, plus feed date parsing."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import IO, Any, Iterator
+
+from dateutil.parser import parse as parse_date
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ENTRY = f"{_ATOM}entry"
+_ID = f"{_ATOM}id"
+_TITLE = f"{_ATOM}title"
+_SUMMARY = f"{_ATOM}summary"
+_PUBLISHED = f"{_ATOM}published"
+_UPDATED = f"{_ATOM}updated"
+_AUTHOR = f"{_ATOM}author"
+_NAME = f"{_ATOM}name"
+_LINK = f"{_ATOM}link"
+_CATEGORY = f"{_ATOM}category"
+
+
+def _text(entry: ET.Element, tag: str) -> str:
+    """Return the text of the first child with the given tag, or ''."""
+    child = entry.find(tag)
+    if child is None or child.text is None:
+        return ""
+    return child.text
+
+
+def _entry_to_dict(entry: ET.Element) -> dict[str, Any]:
+    """Convert an Atom <entry> element into a feedparser-shaped dict."""
+    links: list[dict[str, str]] = []
+    for link in entry.iter(_LINK):
+        rel = link.get("rel", "alternate")
+        # feedparser's defaults for links without an explicit type
+        default_type = "application/atom+xml" if rel == "self" else "text/html"
+        links.append({
+            "href": link.get("href", ""),
+            "rel": rel,
+            "type": link.get("type", default_type),
+        })
+
+    return {
+        "id": _text(entry, _ID),
+        "title": _text(entry, _TITLE),
+        "summary": _text(entry, _SUMMARY),
+        "published": _text(entry, _PUBLISHED),
+        "updated": _text(entry, _UPDATED),
+        "authors": [{"name": _text(author, _NAME)} for author in entry.iter(_AUTHOR)],
+        "links": links,
+        "tags": [{"term": cat.get("term", "")} for cat in entry.iter(_CATEGORY)],
+    }
+
+
+def parse_atom(stream: IO[bytes]) -> Iterator[dict[str, Any]]:
+    """Yield Atom entries as lightweight dicts without building the full DOM.
+
+    The dicts carry the same keys the ``_extract_*`` helpers in
+    ``arxiv_client`` read from feedparser entries (id, title, summary,
+    published, updated, authors, links, tags). Each ``<entry>`` element is
+    cleared once converted, so memory stays flat regardless of feed size.
+
+    Raises ``xml.etree.ElementTree.ParseError`` on malformed XML; entries
+    yielded before the error remain valid.
+    """
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag == _ENTRY:
+            yield _entry_to_dict(elem)
+            elem.clear()
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a feed date string into an aware datetime (naive values → UTC).
+
+    Tries the stdlib ISO 8601 parser (Atom, arXiv) and RFC 2822 parser (RSS)
+    first, and only falls back to dateutil's slower generic parser for
+    anything else. Raises ``ValueError`` or ``OverflowError`` if unparseable.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            parsed = parse_date(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,13 @@
+"""Shared HTTP session for arXiv API and RSS feed downloads."""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connection pool shared by arxiv_client and blog_client.
+# Sized for concurrent feed downloads (see blog_client._MAX_FEED_WORKERS).
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
@@ -10,20 +10,12 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure src/ is on the import path when run as a script
 sys.path.insert(0, os.path.dirname(__file__))
 
-from arxiv_client import fetch_recent_papers
-from blog_client import fetch_blog_posts, fetch_safety_posts
-from config import OUT_DIR
-from slack import (
-    build_daily_briefing_blocks,
-    generate_briefing_markdown,
-    generate_briefing_pdf,
-    send_daily_briefing,
-    upload_file,
-)
+from config import BRIEFING_FORMAT, OUT_DIR, today_jst
 from state import (
     ack_buffer,
     buffer_arxiv_papers,
@@ -38,6 +30,7 @@ from state import (
     mark_blog_notified,
     mark_notified,
     peek_buffer,
+    prune_state,
     save_state,
 )
 
@@ -50,11 +43,24 @@ logger = logging.getLogger(__name__)
 
 def run_collect() -> None:
     """Collect mode: fetch blogs & arXiv, buffer items, save state. No Slack."""
+    # Imported here so brief mode never loads the feed clients
+    from arxiv_client import fetch_recent_papers
+    from blog_client import fetch_blog_posts, fetch_safety_posts
+
     state = load_state()
+    validators = state.setdefault("feed_validators", {})
+
+    # The three fetches are independent network calls, so run them
+    # concurrently. Each feed URL's validators are written by one fetch only;
+    # all other state updates happen below, after the futures resolve.
+    logger.info("Fetching blog RSS, safety RSS and arXiv papers...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        blog_future = executor.submit(fetch_blog_posts, validators)
+        safety_future = executor.submit(fetch_safety_posts, validators)
+        arxiv_future = executor.submit(fetch_recent_papers)
 
     # --- Blog RSS ---
-    logger.info("Fetching blog RSS feeds...")
-    blog_posts = fetch_blog_posts()
+    blog_posts = blog_future.result()
     logger.info("Found %d recent blog posts.", len(blog_posts))
 
     new_blog_posts = filter_new_blog_posts(blog_posts, state)
@@ -67,8 +73,7 @@ def run_collect() -> None:
         logger.info("Saved %d arXiv ID mappings from blog posts.", total_arxiv_from_blogs)
 
     # --- Safety RSS ---
-    logger.info("Fetching safety RSS feeds...")
-    safety_posts = fetch_safety_posts()
+    safety_posts = safety_future.result()
     logger.info("Found %d recent safety posts.", len(safety_posts))
 
     new_safety_posts = filter_new_blog_posts(safety_posts, state)
@@ -83,8 +88,7 @@ def run_collect() -> None:
     # --- arXiv ---
     arxiv_ok = True
     try:
-        logger.info("Fetching recent papers from arXiv...")
-        papers = fetch_recent_papers()
+        papers = arxiv_future.result()
         logger.info("Found %d matching papers in the last 48 hours.", len(papers))
 
         new_papers = filter_new_papers(papers, state)
@@ -94,10 +98,11 @@ def run_collect() -> None:
         keyword_papers: list[dict] = []
 
         for paper in new_papers:
-            blog_info = lookup_blog_for_arxiv(state, paper["arxiv_id"])
+            aid = paper["arxiv_id"]
+            blog_info = lookup_blog_for_arxiv(state, aid)
             if blog_info:
                 linked_items.append({"paper": paper, "blog_info": blog_info})
-                mark_blog_arxiv_linked(state, paper["arxiv_id"])
+                mark_blog_arxiv_linked(state, aid)
             else:
                 keyword_papers.append(paper)
 
@@ -109,7 +114,7 @@ def run_collect() -> None:
             buffer_arxiv_papers(state, keyword_papers)
             logger.info("Buffered %d keyword-matched papers.", len(keyword_papers))
 
-        # Mark arXiv IDs as notified (dedup for future collect runs) and prune
+        # Mark arXiv IDs as notified (dedup for future collect runs)
         all_ids = [p["arxiv_id"] for p in new_papers]
         if all_ids:
             mark_notified(state, all_ids)
@@ -121,68 +126,103 @@ def run_collect() -> None:
             exc_info=True,
         )
 
-    save_state(state)
+    # Drop expired IDs, blog mappings and buffer days once per run
+    prune_state(state)
+    saved = "State saved." if save_state(state) else "State unchanged; save skipped."
     if arxiv_ok:
-        logger.info("Collect done. State saved.")
+        logger.info("Collect done. %s", saved)
     else:
-        logger.info("Collect done (arXiv skipped). Blog data saved.")
+        logger.info("Collect done (arXiv skipped). %s", saved)
 
 
 def run_brief() -> None:
     """Brief mode: peek buffer, build & send daily briefing, ack on success.
 
-    Flow: peek → send (chat.postMessage) → generate md/pdf → upload → ack.
+    Flow: peek → generate md/pdf → send (chat.postMessage) while requesting
+    upload URLs → upload to thread → ack.
     Buffer data is preserved if any step before ack fails.
     """
-    from datetime import datetime
+    if BRIEFING_FORMAT not in ("pdf", "md"):
+        raise ValueError(
+            f"Unknown BRIEFING_FORMAT='{BRIEFING_FORMAT}'. Expected 'pdf' or 'md'."
+        )
 
     state = load_state()
 
     # Phase 1: peek — read without clearing
     items = peek_buffer(state)
-    total = (
-        len(items["blog_posts"])
-        + len(items["arxiv_papers"])
-        + len(items["linked_papers"])
-        + len(items["safety_posts"])
-    )
-
-    logger.info(
-        "Building briefing: %d blogs, %d arXiv, %d linked, %d safety.",
+    counts = (
         len(items["blog_posts"]),
         len(items["arxiv_papers"]),
         len(items["linked_papers"]),
         len(items["safety_posts"]),
     )
+    total = sum(counts)
+
+    if total == 0:
+        logger.info("Buffer is empty; skipping briefing.")
+        return
+
+    # Imported here so collect mode and empty briefings never load the Slack
+    # module (xhtml2pdf is only imported when a PDF is rendered)
+    from slack import (
+        generate_briefing_pdf,
+        render_briefing,
+        request_upload_url,
+        send_daily_briefing,
+        upload_file,
+    )
 
-    # Phase 2: send — raises on failure, buffer untouched
-    blocks = build_daily_briefing_blocks(items)
-    ts = send_daily_briefing(blocks)
-    logger.info("Daily briefing sent to Slack (ts=%s).", ts)
+    logger.info("Building briefing: %d blogs, %d arXiv, %d linked, %d safety.", *counts)
+
+    # Phase 2: build the message and generate Markdown / PDF files.
+    # One JST date is shared by the header, file names and fallback text.
+    date_str = today_jst()
+    blocks, md_content, html = render_briefing(items, date_str)
 
-    # Phase 3: generate Markdown / PDF and upload as thread replies
     OUT_DIR.mkdir(exist_ok=True)
-    date_str = datetime.now().strftime("%Y-%m-%d")
     md_path = OUT_DIR / f"briefing-{date_str}.md"
     pdf_path = OUT_DIR / f"briefing-{date_str}.pdf"
 
-    md_content = generate_briefing_markdown(items)
     md_path.write_text(md_content, encoding="utf-8")
     logger.info("Markdown briefing written to %s.", md_path)
 
-    upload_file(md_path, f"briefing-{date_str}.md", thread_ts=ts)
+    if BRIEFING_FORMAT == "md":
+        pdf_ok = False
+        logger.info("BRIEFING_FORMAT=md; skipping PDF generation.")
+    else:
+        pdf_ok = generate_briefing_pdf(html, pdf_path)
+        if not pdf_ok:
+            logger.warning("PDF generation failed; skipping PDF upload.")
+
+    # Phase 3: send — raises on failure, buffer untouched. Upload URLs do not
+    # depend on the message ts, so request them while the message is posted.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        ts_future = executor.submit(send_daily_briefing, blocks, date_str)
+        md_target_future = executor.submit(request_upload_url, md_path)
+        pdf_target_future = executor.submit(request_upload_url, pdf_path) if pdf_ok else None
+
+    ts = ts_future.result()
+    logger.info("Daily briefing sent to Slack (ts=%s).", ts)
+
+    # Phase 4: upload Markdown / PDF as thread replies
+    upload_file(
+        md_path, f"briefing-{date_str}.md", thread_ts=ts,
+        upload_target=md_target_future.result(),
+    )
     logger.info("Markdown uploaded to Slack thread.")
 
-    if generate_briefing_pdf(items, pdf_path):
-        upload_file(pdf_path, f"briefing-{date_str}.pdf", thread_ts=ts)
+    if pdf_target_future is not None:
+        upload_file(
+            pdf_path, f"briefing-{date_str}.pdf", thread_ts=ts,
+            upload_target=pdf_target_future.result(),
+        )
         logger.info("PDF uploaded to Slack thread.")
-    else:
-        logger.warning("PDF generation failed; skipping PDF upload.")
 
-    # Phase 4: ack — clear buffer only after confirmed send + upload
+    # Phase 5: ack — clear buffer only after confirmed send + upload
     ack_buffer(state)
-    save_state(state)
-    logger.info("Brief done. State saved.")
+    saved = "State saved." if save_state(state) else "State unchanged; save skipped."
+    logger.info("Brief done. %s", saved)
 
 
 def main() -> None:
@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import io
+import json
+from collections.abc import Callable, Sequence
 from pathlib import Path
 from typing import Any
 
 import requests
-from xhtml2pdf import pisa
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import (
     ARXIV_CATEGORIES,
     FETCH_HOURS,
-    JST,
     OUT_DIR,
     SLACK_BOT_TOKEN,
     SLACK_CHANNEL_ID,
+    today_jst,
 )
 
 # Max items shown per briefing section
@@ -24,6 +27,20 @@ _MAX_ITEMS_PER_SECTION = 5
 # Summary preview length in briefing items
 _SUMMARY_PREVIEW_LEN = 150
 
+# Footer category list; ARXIV_CATEGORIES is fixed at import time
+_ARXIV_CATS_JOINED = ", ".join(ARXIV_CATEGORIES)
+
+# Keep-alive session for Slack API calls and the presigned file upload, so
+# the briefing's several requests reuse one TLS connection. urllib3 only
+# retries POSTs on connection errors (before anything was sent), never on a
+# response status, so a message is never posted twice.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+
 
 def _truncate(text: str, limit: int) -> str:
     """Truncate text and append ellipsis if it exceeds the limit."""
@@ -55,13 +72,16 @@ def _slack_api(
 
     if files is not None:
         # multipart/form-data — do NOT set Content-Type; requests handles it
-        resp = requests.post(url, headers=headers, data=data, files=files, timeout=60)
+        resp = _SESSION.post(url, headers=headers, data=data, files=files, timeout=60)
     elif data is not None:
         # application/x-www-form-urlencoded (required by some methods)
-        resp = requests.post(url, headers=headers, data=data, timeout=30)
+        resp = _SESSION.post(url, headers=headers, data=data, timeout=30)
     else:
+        # Serialize ourselves: requests' json= escapes every non-ASCII
+        # character (emoji, Japanese) as \uXXXX and pads separators.
         headers["Content-Type"] = "application/json; charset=utf-8"
-        resp = requests.post(url, headers=headers, json=json_data, timeout=30)
+        payload = json.dumps(json_data, ensure_ascii=False, separators=(",", ":"))
+        resp = _SESSION.post(url, headers=headers, data=payload.encode("utf-8"), timeout=30)
 
     resp.raise_for_status()
     body = resp.json()
@@ -74,221 +94,156 @@ def _slack_api(
 
 
 # ---------------------------------------------------------------------------
-# Daily Briefing builder
+# Briefing item preparation (shared by Block Kit / Markdown / PDF output)
 # ---------------------------------------------------------------------------
 
-def _build_blog_item(post: dict[str, Any]) -> str:
-    """Format a single blog post as mrkdwn text."""
-    title = post.get("title", "No title")
-    url = post.get("url", "")
-    source = post.get("source", "Blog")
-    published = post.get("published", "")[:10]  # YYYY-MM-DD
+# (total count, prepared entries for the items actually shown)
+_Section = tuple[int, list[dict[str, Any]]]
 
-    line = f"*<{url}|{title}>*\n_{source}_ \u00b7 {published}"
 
-    arxiv_ids = post.get("arxiv_ids", [])
-    if arxiv_ids:
-        links = ", ".join(f"<https://arxiv.org/abs/{aid}|{aid}>" for aid in arxiv_ids[:3])
-        line += f" \u00b7 arXiv: {links}"
+def _prepare_post(post: dict[str, Any]) -> dict[str, Any]:
+    """Normalize a blog post into the fields the briefing renderers use."""
+    return {
+        "title": post.get("title", "No title"),
+        "url": post.get("url", ""),
+        "source": post.get("source", "Blog"),
+        "published": post.get("published", "")[:10],  # YYYY-MM-DD
+        "arxiv_ids": post.get("arxiv_ids", [])[:3],
+        "summary": _truncate(post.get("summary", ""), _SUMMARY_PREVIEW_LEN),
+    }
 
-    summary = post.get("summary", "")
-    if summary:
-        line += f"\n{_truncate(summary, _SUMMARY_PREVIEW_LEN)}"
 
-    return line
+def _prepare_paper(paper: dict[str, Any]) -> dict[str, Any]:
+    """Normalize an arXiv paper into the fields the briefing renderers use."""
+    arxiv_id = paper.get("arxiv_id", "unknown")
+    return {
+        "title": paper.get("title", "No title"),
+        "arxiv_id": arxiv_id,
+        "link": paper.get("link", f"https://arxiv.org/abs/{arxiv_id}"),
+        "pdf_link": f"https://arxiv.org/pdf/{arxiv_id}",
+        "keywords": ", ".join(paper.get("matched_keywords", [])),
+        "summary": _truncate(paper.get("summary", ""), _SUMMARY_PREVIEW_LEN),
+    }
 
 
-def _build_arxiv_item(paper: dict[str, Any]) -> str:
-    """Format a single arXiv paper as mrkdwn text."""
-    title = paper.get("title", "No title")
-    arxiv_id = paper.get("arxiv_id", "unknown")
-    link = paper.get("link", f"https://arxiv.org/abs/{arxiv_id}")
-    keywords = ", ".join(paper.get("matched_keywords", []))
+def _prepare_linked(item: dict[str, Any]) -> dict[str, Any]:
+    """Normalize a blog-linked arXiv paper into the fields the renderers use."""
+    blog_info = item.get("blog_info", {})
+    entry = _prepare_paper(item.get("paper", {}))
+    entry["blog_source"] = blog_info.get("blog_source", "Blog")
+    entry["blog_title"] = blog_info.get("blog_title", "")
+    entry["blog_url"] = blog_info.get("blog_url", "")
+    return entry
 
-    line = f"*<{link}|{title}>*\n`{arxiv_id}` \u00b7 {keywords}"
 
-    summary = paper.get("summary", "")
-    if summary:
-        line += f"\n{_truncate(summary, _SUMMARY_PREVIEW_LEN)}"
+def _prepare_section(
+    entries: Sequence[dict[str, Any]], prepare: Callable[[dict[str, Any]], dict[str, Any]]
+) -> _Section:
+    """Count a section and prepare only the entries that will be displayed."""
+    return len(entries), [prepare(e) for e in entries[:_MAX_ITEMS_PER_SECTION]]
 
-    return line
 
+# Stand-in for a missing or None section in the items dict
+_EMPTY: tuple[dict[str, Any], ...] = ()
 
-def _build_linked_item(item: dict[str, Any]) -> str:
-    """Format a blog-linked arXiv paper as mrkdwn text."""
-    paper = item.get("paper", {})
-    blog_info = item.get("blog_info", {})
+# The four sections in briefing order: blog, arXiv, linked, safety
+_Sections = tuple[_Section, _Section, _Section, _Section]
 
-    title = paper.get("title", "No title")
-    arxiv_id = paper.get("arxiv_id", "unknown")
-    link = paper.get("link", f"https://arxiv.org/abs/{arxiv_id}")
-    blog_source = blog_info.get("blog_source", "Blog")
-    blog_title = blog_info.get("blog_title", "")
-    blog_url = blog_info.get("blog_url", "")
 
-    blog_ref = f"<{blog_url}|{blog_title}>" if blog_url and blog_title else blog_source
+def _prepare_items(items: dict[str, list[Any]]) -> _Sections:
+    """Prepare every briefing section for rendering.
 
-    line = f"*<{link}|{title}>*\n`{arxiv_id}` \u00b7 {blog_ref} ({blog_source})"
+    Returns the blog, arXiv, linked and safety sections in that order. Field
+    lookups, defaults, date slicing and summary truncation happen here
+    instead of once per output format.
+    """
+    return (
+        _prepare_section(items.get("blog_posts") or _EMPTY, _prepare_post),
+        _prepare_section(items.get("arxiv_papers") or _EMPTY, _prepare_paper),
+        _prepare_section(items.get("linked_papers") or _EMPTY, _prepare_linked),
+        _prepare_section(items.get("safety_posts") or _EMPTY, _prepare_post),
+    )
 
-    summary = paper.get("summary", "")
-    if summary:
-        line += f"\n{_truncate(summary, _SUMMARY_PREVIEW_LEN)}"
 
-    return line
+# ---------------------------------------------------------------------------
+# Daily Briefing builder
+# ---------------------------------------------------------------------------
 
+# Item template for str.format_map; an absent summary is passed as ""
+_MRKDWN_ITEM_FMT = "*<{link}|{title}>*\n{meta}{summary}"
 
-def build_daily_briefing_blocks(items: dict[str, list[Any]]) -> list[dict[str, Any]]:
-    """Build Block Kit blocks for the daily briefing message.
+# Entity escaping shared by Slack mrkdwn (where <...> is a link or mention
+# such as <!channel>) and the PDF HTML
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
 
-    Args:
-        items: dict with keys blog_posts, arxiv_papers, linked_papers.
 
-    Returns:
-        List of Slack Block Kit block dicts.
-    """
-    date_str = datetime.now(JST).strftime("%Y-%m-%d")
-    blog_posts = items.get("blog_posts", [])
-    arxiv_papers = items.get("arxiv_papers", [])
-    linked_papers = items.get("linked_papers", [])
-    safety_posts = items.get("safety_posts", [])
+def _html_escape(text: str) -> str:
+    """Minimal HTML escaping for user-provided text (single pass)."""
+    return text.translate(_HTML_ESCAPE_TABLE)
 
-    blocks: list[dict[str, Any]] = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": f"Daily AI Research Briefing \u2014 {date_str} (JST)",
-                "emoji": False,
-            },
-        },
-    ]
 
-    # --- Section A: High Priority (blog posts) ---
-    blocks.append({"type": "divider"})
-    header = f":fire:  *High Priority \u2014 Tech Blog Posts*  ({len(blog_posts)})"
-    blocks.append({
-        "type": "section",
-        "text": {"type": "mrkdwn", "text": header},
-    })
-    if blog_posts:
-        shown = blog_posts[:_MAX_ITEMS_PER_SECTION]
-        overflow = len(blog_posts) - len(shown)
-        for post in shown:
-            blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": _build_blog_item(post)},
-            })
-        if overflow > 0:
-            blocks.append({
-                "type": "context",
-                "elements": [{"type": "mrkdwn", "text": f"_+{overflow} more blog posts_"}],
-            })
-    else:
-        blocks.append({
-            "type": "context",
-            "elements": [{"type": "mrkdwn", "text": "_No new blog posts in this period._"}],
-        })
-
-    # --- Section B: Notable arXiv (keyword-matched) ---
-    blocks.append({"type": "divider"})
-    header = f":test_tube:  *Notable arXiv Papers*  ({len(arxiv_papers)})"
-    blocks.append({
-        "type": "section",
-        "text": {"type": "mrkdwn", "text": header},
-    })
-    if arxiv_papers:
-        shown = arxiv_papers[:_MAX_ITEMS_PER_SECTION]
-        overflow = len(arxiv_papers) - len(shown)
-        for paper in shown:
-            blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": _build_arxiv_item(paper)},
-            })
-        if overflow > 0:
-            blocks.append({
-                "type": "context",
-                "elements": [{"type": "mrkdwn", "text": f"_+{overflow} more arXiv papers_"}],
-            })
-    else:
-        blocks.append({
-            "type": "context",
-            "elements": [{"type": "mrkdwn", "text": "_No new keyword-matched papers in this period._"}],
-        })
-
-    # --- Section C: Blog ↔ arXiv Updates (linked) ---
-    blocks.append({"type": "divider"})
-    header = f":link:  *Blog \u2194 arXiv Updates*  ({len(linked_papers)})"
-    blocks.append({
-        "type": "section",
-        "text": {"type": "mrkdwn", "text": header},
+def _mrkdwn_summary(text: str) -> str:
+    """Return the summary suffix for a mrkdwn item, or '' if empty."""
+    return f"\n{_html_escape(text)}" if text else ""
+
+
+def _build_blog_item(post: dict[str, Any]) -> str:
+    """Format a single prepared blog post as mrkdwn text."""
+    meta = f"_{post['source']}_ \u00b7 {post['published']}"
+    arxiv_ids = post["arxiv_ids"]
+    if arxiv_ids:
+        links = ", ".join(f"<https://arxiv.org/abs/{aid}|{aid}>" for aid in arxiv_ids)
+        meta += f" \u00b7 arXiv: {links}"
+
+    return _MRKDWN_ITEM_FMT.format_map({
+        "link": post["url"],
+        "title": _html_escape(post["title"]),
+        "meta": meta,
+        "summary": _mrkdwn_summary(post["summary"]),
     })
-    if linked_papers:
-        shown = linked_papers[:_MAX_ITEMS_PER_SECTION]
-        overflow = len(linked_papers) - len(shown)
-        for item in shown:
-            blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": _build_linked_item(item)},
-            })
-        if overflow > 0:
-            blocks.append({
-                "type": "context",
-                "elements": [{"type": "mrkdwn", "text": f"_+{overflow} more linked papers_"}],
-            })
-    else:
-        blocks.append({
-            "type": "context",
-            "elements": [{"type": "mrkdwn", "text": "_No new blog-linked papers in this period._"}],
-        })
-
-    # --- Section D: AI Safety Watch ---
-    blocks.append({"type": "divider"})
-    header = f":shield:  *AI Safety Watch*  ({len(safety_posts)})"
-    blocks.append({
-        "type": "section",
-        "text": {"type": "mrkdwn", "text": header},
+
+
+def _build_arxiv_item(paper: dict[str, Any]) -> str:
+    """Format a single prepared arXiv paper as mrkdwn text."""
+    return _MRKDWN_ITEM_FMT.format_map({
+        "link": paper["link"],
+        "title": _html_escape(paper["title"]),
+        "meta": f"`{paper['arxiv_id']}` \u00b7 {paper['keywords']}",
+        "summary": _mrkdwn_summary(paper["summary"]),
     })
-    if safety_posts:
-        shown = safety_posts[:_MAX_ITEMS_PER_SECTION]
-        overflow = len(safety_posts) - len(shown)
-        for post in shown:
-            blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": _build_blog_item(post)},
-            })
-        if overflow > 0:
-            blocks.append({
-                "type": "context",
-                "elements": [{"type": "mrkdwn", "text": f"_+{overflow} more safety posts_"}],
-            })
-    else:
-        blocks.append({
-            "type": "context",
-            "elements": [{"type": "mrkdwn", "text": "_No new AI safety posts in this period._"}],
-        })
 
-    # --- Footer ---
-    total = len(blog_posts) + len(arxiv_papers) + len(linked_papers) + len(safety_posts)
-    cats = ", ".join(ARXIV_CATEGORIES)
-    blocks.append({"type": "divider"})
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {
-                "type": "mrkdwn",
-                "text": (
-                    f":bar_chart:  {cats} \u00b7 Past {FETCH_HOURS}h \u00b7 "
-                    f"{len(blog_posts)} blogs, {len(arxiv_papers)} arXiv, "
-                    f"{len(linked_papers)} linked, {len(safety_posts)} safety \u00b7 {total} total"
-                ),
-            },
-        ],
+
+def _build_linked_item(item: dict[str, Any]) -> str:
+    """Format a prepared blog-linked arXiv paper as mrkdwn text."""
+    blog_source = item["blog_source"]
+    blog_title = _html_escape(item["blog_title"])
+    blog_url = item["blog_url"]
+    blog_ref = f"<{blog_url}|{blog_title}>" if blog_url and blog_title else blog_source
+
+    return _MRKDWN_ITEM_FMT.format_map({
+        "link": item["link"],
+        "title": _html_escape(item["title"]),
+        "meta": f"`{item['arxiv_id']}` \u00b7 {blog_ref} ({blog_source})",
+        "summary": _mrkdwn_summary(item["summary"]),
     })
 
-    return blocks
+
+def build_daily_briefing_blocks(
+    items: dict[str, list[Any]], date_str: str | None = None
+) -> list[dict[str, Any]]:
+    """Build Block Kit blocks for the daily briefing message.
+
+    Args:
+        items: dict with keys blog_posts, arxiv_papers, linked_papers.
+        date_str: briefing date (YYYY-MM-DD, JST); defaults to today.
+
+    Returns:
+        List of Slack Block Kit block dicts; empty if there is nothing to report.
+    """
+    return render_briefing(items, date_str)[0]
 
 
-def send_daily_briefing(blocks: list[dict[str, Any]]) -> str:
+def send_daily_briefing(blocks: list[dict[str, Any]], date_str: str | None = None) -> str:
     """Send the daily briefing to Slack via chat.postMessage.
 
     Returns the message ``ts`` (timestamp) for threading follow-up uploads.
@@ -299,7 +254,8 @@ def send_daily_briefing(blocks: list[dict[str, Any]]) -> str:
             "Export it as an environment variable before running."
         )
 
-    date_str = datetime.now(JST).strftime("%Y-%m-%d")
+    if date_str is None:
+        date_str = today_jst()
     body = _slack_api("chat.postMessage", json_data={
         "channel": SLACK_CHANNEL_ID,
         "text": f"Daily AI Research Briefing \u2014 {date_str}",
@@ -308,11 +264,35 @@ def send_daily_briefing(blocks: list[dict[str, Any]]) -> str:
     return body["ts"]
 
 
-def upload_file(file_path: Path, title: str, thread_ts: str | None = None) -> None:
+def request_upload_url(file_path: Path) -> tuple[str, str]:
+    """Obtain a presigned upload URL for a file via files.getUploadURLExternal.
+
+    This is step 1 of the v2 upload flow. It does not depend on the briefing
+    message, so callers may run it concurrently with chat.postMessage.
+
+    Returns ``(upload_url, file_id)``.
+    """
+    file_size = file_path.stat().st_size
+
+    # Form-encoded, not JSON
+    url_resp = _slack_api("files.getUploadURLExternal", data={
+        "filename": file_path.name,
+        "length": str(file_size),
+    })
+    return url_resp["upload_url"], url_resp["file_id"]
+
+
+def upload_file(
+    file_path: Path,
+    title: str,
+    thread_ts: str | None = None,
+    upload_target: tuple[str, str] | None = None,
+) -> None:
     """Upload a file to Slack using the v2 upload flow, optionally as a thread reply.
 
     Steps:
       1. files.getUploadURLExternal → obtain upload_url and file_id
+         (skipped when ``upload_target`` from ``request_upload_url`` is given)
       2. POST file content to the upload_url
       3. files.completeUploadExternal → share file to channel/thread
     """
@@ -322,19 +302,14 @@ def upload_file(file_path: Path, title: str, thread_ts: str | None = None) -> No
             "Export it as an environment variable before running."
         )
 
-    file_size = file_path.stat().st_size
+    # Step 1: get upload URL unless the caller already requested one
+    if upload_target is None:
+        upload_target = request_upload_url(file_path)
+    upload_url, file_id = upload_target
 
-    # Step 1: get upload URL (form-encoded, not JSON)
-    url_resp = _slack_api("files.getUploadURLExternal", data={
-        "filename": file_path.name,
-        "length": str(file_size),
-    })
-    upload_url = url_resp["upload_url"]
-    file_id = url_resp["file_id"]
-
-    # Step 2: upload file content to the presigned URL
+    # Step 2: upload file content to the presigned URL (no Authorization header)
     with open(file_path, "rb") as f:
-        resp = requests.post(upload_url, data=f, timeout=60)
+        resp = _SESSION.post(upload_url, data=f, timeout=60)
     resp.raise_for_status()
 
     # Step 3: complete upload and share to channel/thread
@@ -352,142 +327,77 @@ def upload_file(file_path: Path, title: str, thread_ts: str | None = None) -> No
 # Markdown / PDF briefing generation
 # ---------------------------------------------------------------------------
 
-def generate_briefing_markdown(items: dict[str, list[Any]]) -> str:
-    """Generate a Markdown document equivalent to the Block Kit briefing."""
-    date_str = datetime.now(JST).strftime("%Y-%m-%d")
-    blog_posts = items.get("blog_posts", [])
-    arxiv_papers = items.get("arxiv_papers", [])
-    linked_papers = items.get("linked_papers", [])
-    safety_posts = items.get("safety_posts", [])
-
-    lines: list[str] = []
-    lines.append(f"# Daily AI Research Briefing \u2014 {date_str} (JST)")
-    lines.append("")
-
-    # --- Section A: High Priority ---
-    lines.append(f"## \U0001f525 High Priority \u2014 Tech Blog Posts ({len(blog_posts)})")
-    lines.append("")
-    if blog_posts:
-        for post in blog_posts[:_MAX_ITEMS_PER_SECTION]:
-            title = post.get("title", "No title")
-            url = post.get("url", "")
-            source = post.get("source", "Blog")
-            published = post.get("published", "")[:10]
-            lines.append(f"- **[{title}]({url})**")
-            lines.append(f"  {source} \u00b7 {published}")
-            arxiv_ids = post.get("arxiv_ids", [])
-            if arxiv_ids:
-                links = ", ".join(
-                    f"[{aid}](https://arxiv.org/abs/{aid})" for aid in arxiv_ids[:3]
-                )
-                lines.append(f"  arXiv: {links}")
-            summary = post.get("summary", "")
-            if summary:
-                lines.append(f"  {_truncate(summary, _SUMMARY_PREVIEW_LEN)}")
-            lines.append("")
-        overflow = len(blog_posts) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            lines.append(f"_+{overflow} more blog posts_")
-            lines.append("")
-    else:
-        lines.append("_No new blog posts in this period._")
-        lines.append("")
-
-    # --- Section B: Notable arXiv ---
-    lines.append(f"## \U0001f9ea Notable arXiv Papers ({len(arxiv_papers)})")
-    lines.append("")
-    if arxiv_papers:
-        for paper in arxiv_papers[:_MAX_ITEMS_PER_SECTION]:
-            title = paper.get("title", "No title")
-            arxiv_id = paper.get("arxiv_id", "unknown")
-            link = paper.get("link", f"https://arxiv.org/abs/{arxiv_id}")
-            pdf_link = f"https://arxiv.org/pdf/{arxiv_id}"
-            keywords = ", ".join(paper.get("matched_keywords", []))
-            lines.append(f"- **[{title}]({link})** ([PDF]({pdf_link}))")
-            lines.append(f"  `{arxiv_id}` \u00b7 {keywords}")
-            summary = paper.get("summary", "")
-            if summary:
-                lines.append(f"  {_truncate(summary, _SUMMARY_PREVIEW_LEN)}")
-            lines.append("")
-        overflow = len(arxiv_papers) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            lines.append(f"_+{overflow} more arXiv papers_")
-            lines.append("")
-    else:
-        lines.append("_No new keyword-matched papers in this period._")
-        lines.append("")
-
-    # --- Section C: Blog ↔ arXiv Updates ---
-    lines.append(f"## \U0001f517 Blog \u2194 arXiv Updates ({len(linked_papers)})")
-    lines.append("")
-    if linked_papers:
-        for item in linked_papers[:_MAX_ITEMS_PER_SECTION]:
-            paper = item.get("paper", {})
-            blog_info = item.get("blog_info", {})
-            title = paper.get("title", "No title")
-            arxiv_id = paper.get("arxiv_id", "unknown")
-            link = paper.get("link", f"https://arxiv.org/abs/{arxiv_id}")
-            pdf_link = f"https://arxiv.org/pdf/{arxiv_id}"
-            blog_source = blog_info.get("blog_source", "Blog")
-            blog_title = blog_info.get("blog_title", "")
-            blog_url = blog_info.get("blog_url", "")
-            blog_ref = f"[{blog_title}]({blog_url})" if blog_url and blog_title else blog_source
-            lines.append(f"- **[{title}]({link})** ([PDF]({pdf_link}))")
-            lines.append(f"  `{arxiv_id}` \u00b7 {blog_ref} ({blog_source})")
-            summary = paper.get("summary", "")
-            if summary:
-                lines.append(f"  {_truncate(summary, _SUMMARY_PREVIEW_LEN)}")
-            lines.append("")
-        overflow = len(linked_papers) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            lines.append(f"_+{overflow} more linked papers_")
-            lines.append("")
-    else:
-        lines.append("_No new blog-linked papers in this period._")
-        lines.append("")
-
-    # --- Section D: AI Safety Watch ---
-    lines.append(f"## \U0001f6e1\ufe0f AI Safety Watch ({len(safety_posts)})")
-    lines.append("")
-    if safety_posts:
-        for post in safety_posts[:_MAX_ITEMS_PER_SECTION]:
-            title = post.get("title", "No title")
-            url = post.get("url", "")
-            source = post.get("source", "Blog")
-            published = post.get("published", "")[:10]
-            lines.append(f"- **[{title}]({url})**")
-            lines.append(f"  {source} \u00b7 {published}")
-            arxiv_ids = post.get("arxiv_ids", [])
-            if arxiv_ids:
-                links = ", ".join(
-                    f"[{aid}](https://arxiv.org/abs/{aid})" for aid in arxiv_ids[:3]
-                )
-                lines.append(f"  arXiv: {links}")
-            summary = post.get("summary", "")
-            if summary:
-                lines.append(f"  {_truncate(summary, _SUMMARY_PREVIEW_LEN)}")
-            lines.append("")
-        overflow = len(safety_posts) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            lines.append(f"_+{overflow} more safety posts_")
-            lines.append("")
-    else:
-        lines.append("_No new AI safety posts in this period._")
-        lines.append("")
+# Markdown list-item template; absent {pdf}/{extra}/{summary} are passed as ""
+_MD_ITEM_FMT = "- **[{title}]({link})**{pdf}\n  {meta}{extra}{summary}"
 
-    # --- Footer ---
-    total = len(blog_posts) + len(arxiv_papers) + len(linked_papers) + len(safety_posts)
-    cats = ", ".join(ARXIV_CATEGORIES)
-    lines.append("---")
-    lines.append("")
-    lines.append(
-        f"{cats} \u00b7 Past {FETCH_HOURS}h \u00b7 "
-        f"{len(blog_posts)} blogs, {len(arxiv_papers)} arXiv, "
-        f"{len(linked_papers)} linked, {len(safety_posts)} safety \u00b7 {total} total"
-    )
-    lines.append("")
+# Only < and > need escaping to keep feed text from being read as raw HTML;
+# a literal & stays readable in the .md file
+_MD_ESCAPE_TABLE = str.maketrans({"<": "&lt;", ">": "&gt;"})
+
+
+def _md_escape(text: str) -> str:
+    """Escape < and > in feed-provided text for Markdown output."""
+    return text.translate(_MD_ESCAPE_TABLE)
+
+
+def _md_summary(text: str) -> str:
+    """Return the summary line for a Markdown item, or '' if empty."""
+    return f"\n  {_md_escape(text)}" if text else ""
+
+
+def _md_blog_item(post: dict[str, Any]) -> str:
+    """Format a single prepared blog post as a Markdown list item."""
+    arxiv_ids = post["arxiv_ids"]
+    extra = ""
+    if arxiv_ids:
+        links = ", ".join(f"[{aid}](https://arxiv.org/abs/{aid})" for aid in arxiv_ids)
+        extra = f"\n  arXiv: {links}"
+
+    return _MD_ITEM_FMT.format_map({
+        "title": _md_escape(post["title"]),
+        "link": post["url"],
+        "pdf": "",
+        "meta": f"{post['source']} \u00b7 {post['published']}",
+        "extra": extra,
+        "summary": _md_summary(post["summary"]),
+    })
+
+
+def _md_arxiv_item(paper: dict[str, Any]) -> str:
+    """Format a single prepared arXiv paper as a Markdown list item."""
+    return _MD_ITEM_FMT.format_map({
+        "title": _md_escape(paper["title"]),
+        "link": paper["link"],
+        "pdf": f" ([PDF]({paper['pdf_link']}))",
+        "meta": f"`{paper['arxiv_id']}` \u00b7 {paper['keywords']}",
+        "extra": "",
+        "summary": _md_summary(paper["summary"]),
+    })
 
-    return "\n".join(lines)
+
+def _md_linked_item(item: dict[str, Any]) -> str:
+    """Format a prepared blog-linked arXiv paper as a Markdown list item."""
+    blog_source = item["blog_source"]
+    blog_title = _md_escape(item["blog_title"])
+    blog_url = item["blog_url"]
+    blog_ref = f"[{blog_title}]({blog_url})" if blog_url and blog_title else blog_source
+
+    return _MD_ITEM_FMT.format_map({
+        "title": _md_escape(item["title"]),
+        "link": item["link"],
+        "pdf": f" ([PDF]({item['pdf_link']}))",
+        "meta": f"`{item['arxiv_id']}` \u00b7 {blog_ref} ({blog_source})",
+        "extra": "",
+        "summary": _md_summary(item["summary"]),
+    })
+
+
+def generate_briefing_markdown(items: dict[str, list[Any]], date_str: str | None = None) -> str:
+    """Generate a Markdown document equivalent to the Block Kit briefing.
+
+    Returns an empty string if every section is empty.
+    """
+    return render_briefing(items, date_str)[1]
 
 
 _PDF_CSS = """\
@@ -511,200 +421,266 @@ h1 { font-size: 18px; color: #0f3460; border-bottom: 2px solid #e94560; padding-
           font-size: 9px; color: #777; }
 """
 
+# Fixed document head (doctype + stylesheet), assembled once at import
+_PDF_HEAD = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8">\n'
+    f"<style>{_PDF_CSS}</style></head><body>"
+)
 
-def _html_escape(text: str) -> str:
-    """Minimal HTML escaping for user-provided text."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
+# PDF card template; absent {pdf}/{summary} are passed as ""
+_HTML_CARD_FMT = (
+    '<div class="card">\n'
+    '<p class="card-title"><a href="{link}">{title}</a>{pdf}</p>\n'
+    '<p class="card-meta">{meta}</p>{summary}\n'
+    "</div>"
+)
 
-def _build_pdf_html(items: dict[str, list[Any]]) -> str:
-    """Build styled HTML for PDF directly from briefing items."""
-    date_str = datetime.now(JST).strftime("%Y-%m-%d")
-    blog_posts = items.get("blog_posts", [])
-    arxiv_papers = items.get("arxiv_papers", [])
-    linked_papers = items.get("linked_papers", [])
-    safety_posts = items.get("safety_posts", [])
+_HTML_PDF_LINK_FMT = (
+    ' &nbsp;<a href="{}" style="font-size:9px;font-weight:normal;">[PDF]</a>'
+)
 
-    parts: list[str] = [
-        '<!DOCTYPE html><html><head><meta charset="utf-8">',
-        f"<style>{_PDF_CSS}</style></head><body>",
-        f"<h1>Daily AI Research Briefing &mdash; {date_str} (JST)</h1>",
-    ]
 
-    # --- Section A: High Priority ---
-    parts.append('<div class="section">')
-    parts.append(
-        f'<div class="section-head">High Priority &mdash; Tech Blog Posts ({len(blog_posts)})</div>'
-    )
-    if blog_posts:
-        for post in blog_posts[:_MAX_ITEMS_PER_SECTION]:
-            title = _html_escape(post.get("title", "No title"))
-            url = post.get("url", "")
-            source = _html_escape(post.get("source", "Blog"))
-            published = post.get("published", "")[:10]
-            arxiv_ids = post.get("arxiv_ids", [])
-            summary = post.get("summary", "")
-
-            parts.append('<div class="card">')
-            parts.append(f'<p class="card-title"><a href="{url}">{title}</a></p>')
-            meta = f"{source} &middot; {published}"
-            if arxiv_ids:
-                links = ", ".join(
-                    f'<a href="https://arxiv.org/abs/{aid}">{aid}</a>'
-                    for aid in arxiv_ids[:3]
-                )
-                meta += f" &middot; arXiv: {links}"
-            parts.append(f'<p class="card-meta">{meta}</p>')
-            if summary:
-                parts.append(
-                    f'<p class="card-summary">{_html_escape(_truncate(summary, _SUMMARY_PREVIEW_LEN))}</p>'
-                )
-            parts.append("</div>")
-
-        overflow = len(blog_posts) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            parts.append(f'<p class="overflow">+{overflow} more blog posts</p>')
-    else:
-        parts.append('<p class="overflow">No new blog posts in this period.</p>')
-    parts.append("</div>")
+def _html_summary(text: str) -> str:
+    """Return the summary paragraph for a card, or '' if empty."""
+    if not text:
+        return ""
+    return f'\n<p class="card-summary">{_html_escape(text)}</p>'
 
-    # --- Section B: Notable arXiv ---
-    parts.append('<div class="section">')
-    parts.append(
-        f'<div class="section-head">Notable arXiv Papers ({len(arxiv_papers)})</div>'
-    )
-    if arxiv_papers:
-        for paper in arxiv_papers[:_MAX_ITEMS_PER_SECTION]:
-            title = _html_escape(paper.get("title", "No title"))
-            arxiv_id = paper.get("arxiv_id", "unknown")
-            link = paper.get("link", f"https://arxiv.org/abs/{arxiv_id}")
-            pdf_link = f"https://arxiv.org/pdf/{arxiv_id}"
-            keywords = _html_escape(", ".join(paper.get("matched_keywords", [])))
-            summary = paper.get("summary", "")
-
-            parts.append('<div class="card">')
-            parts.append(
-                f'<p class="card-title"><a href="{link}">{title}</a>'
-                f' &nbsp;<a href="{pdf_link}" style="font-size:9px;font-weight:normal;">[PDF]</a></p>'
-            )
-            parts.append(
-                f'<p class="card-meta"><span class="tag">{arxiv_id}</span> &middot; {keywords}</p>'
-            )
-            if summary:
-                parts.append(
-                    f'<p class="card-summary">{_html_escape(_truncate(summary, _SUMMARY_PREVIEW_LEN))}</p>'
-                )
-            parts.append("</div>")
-
-        overflow = len(arxiv_papers) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            parts.append(f'<p class="overflow">+{overflow} more arXiv papers</p>')
-    else:
-        parts.append('<p class="overflow">No new keyword-matched papers in this period.</p>')
-    parts.append("</div>")
 
-    # --- Section C: Blog <-> arXiv Updates ---
-    parts.append('<div class="section">')
-    parts.append(
-        f'<div class="section-head">Blog / arXiv Updates ({len(linked_papers)})</div>'
-    )
-    if linked_papers:
-        for item in linked_papers[:_MAX_ITEMS_PER_SECTION]:
-            paper = item.get("paper", {})
-            blog_info = item.get("blog_info", {})
-            title = _html_escape(paper.get("title", "No title"))
-            arxiv_id = paper.get("arxiv_id", "unknown")
-            link = paper.get("link", f"https://arxiv.org/abs/{arxiv_id}")
-            pdf_link = f"https://arxiv.org/pdf/{arxiv_id}"
-            blog_source = _html_escape(blog_info.get("blog_source", "Blog"))
-            blog_title = _html_escape(blog_info.get("blog_title", ""))
-            blog_url = blog_info.get("blog_url", "")
-            summary = paper.get("summary", "")
-
-            blog_ref = (
-                f'<a href="{blog_url}">{blog_title}</a>'
-                if blog_url and blog_title
-                else blog_source
-            )
-
-            parts.append('<div class="card">')
-            parts.append(
-                f'<p class="card-title"><a href="{link}">{title}</a>'
-                f' &nbsp;<a href="{pdf_link}" style="font-size:9px;font-weight:normal;">[PDF]</a></p>'
-            )
-            parts.append(
-                f'<p class="card-meta"><span class="tag">{arxiv_id}</span>'
-                f" &middot; {blog_ref} ({blog_source})</p>"
-            )
-            if summary:
-                parts.append(
-                    f'<p class="card-summary">{_html_escape(_truncate(summary, _SUMMARY_PREVIEW_LEN))}</p>'
-                )
-            parts.append("</div>")
-
-        overflow = len(linked_papers) - _MAX_ITEMS_PER_SECTION
-        if overflow > 0:
-            parts.append(f'<p class="overflow">+{overflow} more linked papers</p>')
-    else:
-        parts.append('<p class="overflow">No new blog-linked papers in this period.</p>')
-    parts.append("</div>")
+def _html_blog_item(post: dict[str, Any]) -> str:
+    """Format a single prepared blog post as an HTML card."""
+    meta = f"{_html_escape(post['source'])} &middot; {post['published']}"
+    arxiv_ids = post["arxiv_ids"]
+    if arxiv_ids:
+        links = ", ".join(
+            f'<a href="https://arxiv.org/abs/{aid}">{aid}</a>' for aid in arxiv_ids
+        )
+        meta += f" &middot; arXiv: {links}"
+
+    return _HTML_CARD_FMT.format_map({
+        "link": post["url"],
+        "title": _html_escape(post["title"]),
+        "pdf": "",
+        "meta": meta,
+        "summary": _html_summary(post["summary"]),
+    })
 
-    # --- Section D: AI Safety Watch ---
-    parts.append('<div class="section">')
-    parts.append(
-        f'<div class="section-head">AI Safety Watch ({len(safety_posts)})</div>'
+
+def _html_arxiv_item(paper: dict[str, Any]) -> str:
+    """Format a single prepared arXiv paper as an HTML card."""
+    return _HTML_CARD_FMT.format_map({
+        "link": paper["link"],
+        "title": _html_escape(paper["title"]),
+        "pdf": _HTML_PDF_LINK_FMT.format(paper["pdf_link"]),
+        "meta": f'<span class="tag">{paper["arxiv_id"]}</span> &middot; '
+                f"{_html_escape(paper['keywords'])}",
+        "summary": _html_summary(paper["summary"]),
+    })
+
+
+def _html_linked_item(item: dict[str, Any]) -> str:
+    """Format a prepared blog-linked arXiv paper as an HTML card."""
+    blog_source = _html_escape(item["blog_source"])
+    blog_title = _html_escape(item["blog_title"])
+    blog_url = item["blog_url"]
+    blog_ref = (
+        f'<a href="{blog_url}">{blog_title}</a>'
+        if blog_url and blog_title
+        else blog_source
     )
-    if safety_posts:
-        for post in safety_posts[:_MAX_ITEMS_PER_SECTION]:
-            title = _html_escape(post.get("title", "No title"))
-            url = post.get("url", "")
-            source = _html_escape(post.get("source", "Blog"))
-            published = post.get("published", "")[:10]
-            arxiv_ids = post.get("arxiv_ids", [])
-            summary = post.get("summary", "")
-
-            parts.append('<div class="card">')
-            parts.append(f'<p class="card-title"><a href="{url}">{title}</a></p>')
-            meta = f"{source} &middot; {published}"
-            if arxiv_ids:
-                links = ", ".join(
-                    f'<a href="https://arxiv.org/abs/{aid}">{aid}</a>'
-                    for aid in arxiv_ids[:3]
-                )
-                meta += f" &middot; arXiv: {links}"
-            parts.append(f'<p class="card-meta">{meta}</p>')
-            if summary:
-                parts.append(
-                    f'<p class="card-summary">{_html_escape(_truncate(summary, _SUMMARY_PREVIEW_LEN))}</p>'
-                )
-            parts.append("</div>")
-
-        overflow = len(safety_posts) - _MAX_ITEMS_PER_SECTION
+
+    return _HTML_CARD_FMT.format_map({
+        "link": item["link"],
+        "title": _html_escape(item["title"]),
+        "pdf": _HTML_PDF_LINK_FMT.format(item["pdf_link"]),
+        "meta": f'<span class="tag">{item["arxiv_id"]}</span> &middot; {blog_ref} ({blog_source})',
+        "summary": _html_summary(item["summary"]),
+    })
+
+
+# ---------------------------------------------------------------------------
+# Fused renderer: Block Kit, Markdown and PDF HTML in one pass over the items
+# ---------------------------------------------------------------------------
+
+# (mrkdwn, Markdown, HTML) formatters for one kind of item
+_ItemFormatters = tuple[
+    Callable[[dict[str, Any]], str],
+    Callable[[dict[str, Any]], str],
+    Callable[[dict[str, Any]], str],
+]
+
+# Per section, in briefing order: (Block Kit header, Markdown heading,
+# HTML heading, item formatters, overflow noun, empty-state text)
+_SECTION_SPECS: tuple[tuple[str, str, str, _ItemFormatters, str, str], ...] = (
+    (
+        ":fire:  *High Priority \u2014 Tech Blog Posts*",
+        "\U0001f525 High Priority \u2014 Tech Blog Posts",
+        "High Priority &mdash; Tech Blog Posts",
+        (_build_blog_item, _md_blog_item, _html_blog_item),
+        "blog posts",
+        "No new blog posts in this period.",
+    ),
+    (
+        ":test_tube:  *Notable arXiv Papers*",
+        "\U0001f9ea Notable arXiv Papers",
+        "Notable arXiv Papers",
+        (_build_arxiv_item, _md_arxiv_item, _html_arxiv_item),
+        "arXiv papers",
+        "No new keyword-matched papers in this period.",
+    ),
+    (
+        ":link:  *Blog \u2194 arXiv Updates*",
+        "\U0001f517 Blog \u2194 arXiv Updates",
+        "Blog / arXiv Updates",
+        (_build_linked_item, _md_linked_item, _html_linked_item),
+        "linked papers",
+        "No new blog-linked papers in this period.",
+    ),
+    (
+        ":shield:  *AI Safety Watch*",
+        "\U0001f6e1\ufe0f AI Safety Watch",
+        "AI Safety Watch",
+        (_build_blog_item, _md_blog_item, _html_blog_item),
+        "safety posts",
+        "No new AI safety posts in this period.",
+    ),
+)
+
+# Shared by every divider position; blocks are only serialized, never mutated
+_DIVIDER: dict[str, Any] = {"type": "divider"}
+
+
+def _section_block(text: str) -> dict[str, Any]:
+    """Return a mrkdwn section block."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def _context_block(text: str) -> dict[str, Any]:
+    """Return a context block holding one mrkdwn element."""
+    return {"type": "context", "elements": [{"type": "mrkdwn", "text": text}]}
+
+
+def _render_section(
+    blocks: list[dict[str, Any]],
+    lines: list[str],
+    parts: list[str],
+    spec: tuple[str, str, str, _ItemFormatters, str, str],
+    section: _Section,
+) -> None:
+    """Render one briefing section into the Block Kit, Markdown and HTML buffers."""
+    header, md_heading, html_heading, formatters, noun, empty_text = spec
+    build_item, md_item, html_item = formatters
+    n, shown = section
+
+    section_blocks = [_DIVIDER, _section_block(f"{header}  ({n})")]
+    lines += [f"## {md_heading} ({n})", ""]
+    parts += ['<div class="section">', f'<div class="section-head">{html_heading} ({n})</div>']
+
+    if n:
+        for item in shown:
+            section_blocks.append(_section_block(build_item(item)))
+            lines += [md_item(item), ""]
+            parts.append(html_item(item))
+        overflow = n - len(shown)
         if overflow > 0:
-            parts.append(f'<p class="overflow">+{overflow} more safety posts</p>')
+            section_blocks.append(_context_block(f"_+{overflow} more {noun}_"))
+            lines += [f"_+{overflow} more {noun}_", ""]
+            parts.append(f'<p class="overflow">+{overflow} more {noun}</p>')
     else:
-        parts.append('<p class="overflow">No new AI safety posts in this period.</p>')
+        section_blocks.append(_context_block(f"_{empty_text}_"))
+        lines += [f"_{empty_text}_", ""]
+        parts.append(f'<p class="overflow">{empty_text}</p>')
+
     parts.append("</div>")
+    blocks.extend(section_blocks)
+
+
+def render_briefing(
+    items: dict[str, list[Any]], date_str: str | None = None
+) -> tuple[list[dict[str, Any]], str, str]:
+    """Render the Block Kit blocks, Markdown and PDF HTML in a single pass.
+
+    Each prepared item is visited once and formatted for all three outputs.
+
+    Args:
+        items: dict with keys blog_posts, arxiv_papers, linked_papers, safety_posts.
+        date_str: briefing date (YYYY-MM-DD, JST); defaults to today.
+
+    Returns:
+        ``(blocks, markdown, html)``; all three are empty if every section is empty.
+    """
+    if date_str is None:
+        date_str = today_jst()
+
+    sections = _prepare_items(items)
+    n_blog, n_arxiv, n_linked, n_safety = (n for n, _ in sections)
+    total = n_blog + n_arxiv + n_linked + n_safety
+    if not total:
+        return [], "", ""
+
+    blocks: list[dict[str, Any]] = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"Daily AI Research Briefing \u2014 {date_str} (JST)",
+                "emoji": False,
+            },
+        },
+    ]
+    lines: list[str] = [f"# Daily AI Research Briefing \u2014 {date_str} (JST)", ""]
+    parts: list[str] = [
+        _PDF_HEAD,
+        f"<h1>Daily AI Research Briefing &mdash; {date_str} (JST)</h1>",
+    ]
+
+    for spec, section in zip(_SECTION_SPECS, sections):
+        _render_section(blocks, lines, parts, spec, section)
 
     # --- Footer ---
-    total = len(blog_posts) + len(arxiv_papers) + len(linked_papers) + len(safety_posts)
-    cats = ", ".join(ARXIV_CATEGORIES)
+    blocks.append(_DIVIDER)
+    blocks.append(_context_block(
+        f":bar_chart:  {_ARXIV_CATS_JOINED} \u00b7 Past {FETCH_HOURS}h \u00b7 "
+        f"{n_blog} blogs, {n_arxiv} arXiv, "
+        f"{n_linked} linked, {n_safety} safety \u00b7 {total} total"
+    ))
+    lines += [
+        "---",
+        "",
+        f"{_ARXIV_CATS_JOINED} \u00b7 Past {FETCH_HOURS}h \u00b7 "
+        f"{n_blog} blogs, {n_arxiv} arXiv, "
+        f"{n_linked} linked, {n_safety} safety \u00b7 {total} total",
+        "",
+    ]
     parts.append(
-        f'<div class="footer">{cats} &middot; Past {FETCH_HOURS}h &middot; '
-        f"{len(blog_posts)} blogs, {len(arxiv_papers)} arXiv, "
-        f"{len(linked_papers)} linked, {len(safety_posts)} safety &middot; {total} total</div>"
+        f'<div class="footer">{_ARXIV_CATS_JOINED} &middot; Past {FETCH_HOURS}h &middot; '
+        f"{n_blog} blogs, {n_arxiv} arXiv, "
+        f"{n_linked} linked, {n_safety} safety &middot; {total} total</div>"
     )
-
     parts.append("</body></html>")
-    return "\n".join(parts)
+
+    return blocks, "\n".join(lines), "\n".join(parts)
 
 
-def generate_briefing_pdf(items: dict[str, list[Any]], pdf_path: Path) -> bool:
-    """Generate a styled PDF briefing directly from items data.
+def generate_briefing_pdf(html: str, pdf_path: Path) -> bool:
+    """Convert the briefing HTML from ``render_briefing`` into a styled PDF.
 
-    Returns ``True`` on success, ``False`` on conversion failure.
+    Returns ``True`` once ``pdf_path`` has been written, ``False`` on
+    conversion failure or when ``html`` is empty (nothing is written).
     """
-    html = _build_pdf_html(items)
-    with open(pdf_path, "wb") as f:
-        status = pisa.CreatePDF(html, dest=f)
-    return not status.err
+    if not html:
+        return False
+
+    # Imported lazily: xhtml2pdf is heavy and unused when BRIEFING_FORMAT=md
+    from xhtml2pdf import pisa
+
+    # An explicit encoding lets pisa encode once and skips html5lib's
+    # charset sniffing of the generated document. pisa emits many small
+    # writes, so render in memory and write the finished file in one go.
+    buf = io.BytesIO()
+    status = pisa.CreatePDF(html, dest=buf, encoding="utf-8")
+    if status.err:
+        return False
+    pdf_path.write_bytes(buf.getbuffer())
+    return True
@@ -5,22 +5,62 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import datetime, timedelta, timezone
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from operator import itemgetter
 from typing import Any
 
-from config import BLOG_RETENTION_DAYS, BUFFER_RETENTION_DAYS, FETCH_HOURS, JST, STATE_FILE
+from config import (
+    BLOG_FEEDS,
+    BLOG_RETENTION_DAYS,
+    BUFFER_RETENTION_DAYS,
+    FETCH_HOURS,
+    JST,
+    MAX_NOTIFIED_IDS,
+    SAFETY_FEEDS,
+    STATE_FILE,
+    today_jst,
+)
 
 logger = logging.getLogger(__name__)
 
 # Keep arXiv IDs for FETCH_HOURS + 24h buffer to cover timing edge cases
 _RETENTION_HOURS = FETCH_HOURS + 24
 
-_DEFAULT_STATE: dict[str, Any] = {
-    "notified_ids": {},
-    "notified_blog_urls": {},
-    "blog_arxiv_map": {},
-    "daily_buffer": {},
-}
+# Feed URLs whose conditional-GET validators are worth keeping
+_FEED_URLS = frozenset(chain(BLOG_FEEDS.values(), SAFETY_FEEDS.values()))
+
+
+# blog_arxiv_map values are stored positionally as lists in this field order
+_BLOG_INFO_FIELDS = ("blog_url", "blog_title", "blog_source", "added_at")
+_ADDED_AT = 3
+
+
+def _fresh_state() -> dict[str, Any]:
+    """Return a new default (empty) state."""
+    return {
+        "notified_ids": {},
+        "notified_blog_urls": {},
+        "blog_arxiv_map": {},
+        "daily_buffer": {},
+        "feed_validators": {},
+    }
+
+
+# Bytes of state.json as last loaded or saved; save_state skips the write
+# when the new serialization is identical
+_last_saved: bytes | None = None
+
+_URL_KEY = itemgetter("url")
+_ARXIV_ID_KEY = itemgetter("arxiv_id")
+
+
+def _linked_key(item: dict[str, Any]) -> str:
+    """Dedup key for a linked_papers entry: the paper's arXiv ID."""
+    return item["paper"]["arxiv_id"]
+
 
 _EMPTY_DAY: dict[str, list[Any]] = {
     "blog_posts": [],
@@ -30,85 +70,166 @@ _EMPTY_DAY: dict[str, list[Any]] = {
 }
 
 
-def _today_jst() -> str:
-    """Return today's date in JST as YYYY-MM-DD."""
-    return datetime.now(JST).strftime("%Y-%m-%d")
+def _to_epoch(value: Any) -> int:
+    """Convert a stored timestamp (epoch seconds or legacy ISO 8601) to int."""
+    if isinstance(value, str):
+        try:
+            return int(datetime.fromisoformat(value).timestamp())
+        except ValueError:
+            return 0  # unparseable: treat as expired
+    return int(value)
+
 
+def _migrate_legacy_formats(data: dict[str, Any]) -> None:
+    """Upgrade legacy entries in place.
 
-def _ensure_buffer_day(state: dict[str, Any], date_key: str) -> None:
-    """Ensure the daily_buffer has an entry for the given date."""
+    ISO string timestamps become epoch seconds, and dict-shaped
+    blog_arxiv_map entries become ``[url, title, source, added_at]`` lists.
+    """
+    for key in ("notified_ids", "notified_blog_urls"):
+        entries = data.get(key)
+        if isinstance(entries, dict):
+            for k, ts in entries.items():
+                if not isinstance(ts, int):
+                    entries[k] = _to_epoch(ts)
+    arxiv_map = data.get("blog_arxiv_map")
+    if isinstance(arxiv_map, dict):
+        for aid, info in arxiv_map.items():
+            if isinstance(info, dict):
+                info = arxiv_map[aid] = [info.get(field, "") for field in _BLOG_INFO_FIELDS]
+            if not isinstance(info[_ADDED_AT], int):
+                info[_ADDED_AT] = _to_epoch(info[_ADDED_AT])
+
+
+def _ensure_buffer_day(state: dict[str, Any], date_key: str) -> dict[str, list[Any]]:
+    """Ensure the daily_buffer has an entry for the given date and return it."""
     buf = state.setdefault("daily_buffer", {})
-    if date_key not in buf:
-        buf[date_key] = {k: list(v) for k, v in _EMPTY_DAY.items()}
+    day = buf.get(date_key)
+    if day is None:
+        day = buf[date_key] = {k: list(v) for k, v in _EMPTY_DAY.items()}
+    return day
+
+
+def _append_unique(
+    entries: list[dict[str, Any]],
+    items: list[dict[str, Any]],
+    key: Callable[[dict[str, Any]], str],
+) -> None:
+    """Append items whose key is not yet in entries, skipping repeats within items."""
+    seen = {key(e) for e in entries}
+    for item in items:
+        k = key(item)
+        if k not in seen:
+            seen.add(k)
+            entries.append(item)
 
 
 def load_state() -> dict[str, Any]:
     """Load the state file. Returns default structure if missing or corrupt."""
+    global _last_saved
     if not os.path.exists(STATE_FILE):
-        return {k: (dict(v) if isinstance(v, dict) else v) for k, v in _DEFAULT_STATE.items()}
+        return _fresh_state()
     try:
-        with open(STATE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(STATE_FILE, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        _last_saved = raw
     except (json.JSONDecodeError, ValueError) as exc:
         logger.warning("Corrupt state.json, starting fresh: %s", exc)
-        return {k: (dict(v) if isinstance(v, dict) else v) for k, v in _DEFAULT_STATE.items()}
+        return _fresh_state()
     # Migrate from old list format to dict format
     ids = data.get("notified_ids", {})
     if isinstance(ids, list):
-        now = datetime.now(timezone.utc).isoformat()
+        now = int(time.time())
         data["notified_ids"] = {aid: now for aid in ids}
+    # Migrate ISO string timestamps and dict-shaped blog_arxiv_map entries
+    _migrate_legacy_formats(data)
     # Ensure all keys exist for forward compatibility
-    for key, default in _DEFAULT_STATE.items():
-        if key not in data:
-            data[key] = dict(default) if isinstance(default, dict) else default
+    for key, default in _fresh_state().items():
+        data.setdefault(key, default)
     return data
 
 
-def save_state(state: dict[str, Any]) -> None:
-    """Save state back to the JSON file."""
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+def save_state(state: dict[str, Any]) -> bool:
+    """Save state back to the JSON file atomically.
+
+    The document is serialized as compact JSON in one ``json.dumps`` call,
+    written to a temporary file in a single write, and moved over
+    ``STATE_FILE`` with ``os.replace``, so an interrupted run never leaves a
+    truncated file.
+    The write is skipped when the bytes match what was last loaded or saved.
 
+    Returns ``True`` if the file was written, ``False`` if it was unchanged.
+    """
+    global _last_saved
+    # No indentation: state.json only lives in the Actions cache
+    text = json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+    data = (text + "\n").encode("utf-8")
+    if data == _last_saved:
+        return False
+    tmp_path = STATE_FILE + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, STATE_FILE)
+    _last_saved = data
+    return True
+
+
+def _delete_keys(mapping: dict[str, Any], stale: list[str]) -> None:
+    """Delete the given keys in place; surviving entries are left untouched."""
+    for key in stale:
+        del mapping[key]
+
+
+def prune_state(state: dict[str, Any]) -> None:
+    """Remove IDs, blog entries, and buffer days older than retention windows.
+
+    Feed validators of feeds no longer in the config are dropped as well.
+    Called once per collect run, just before the state is saved.
+    """
+    now = int(time.time())
 
-def _prune_old_ids(state: dict[str, Any]) -> None:
-    """Remove IDs, blog entries, and buffer days older than retention windows."""
     # Prune arXiv notified IDs
-    arxiv_cutoff = datetime.now(timezone.utc) - timedelta(hours=_RETENTION_HOURS)
+    arxiv_cutoff = now - _RETENTION_HOURS * 3600
     ids = state.get("notified_ids", {})
-    state["notified_ids"] = {
-        aid: ts for aid, ts in ids.items()
-        if ts > arxiv_cutoff.isoformat()
-    }
+    _delete_keys(ids, [aid for aid, ts in ids.items() if ts <= arxiv_cutoff])
 
     # Prune blog-related entries (30-day retention)
-    blog_cutoff = datetime.now(timezone.utc) - timedelta(days=BLOG_RETENTION_DAYS)
-    blog_cutoff_iso = blog_cutoff.isoformat()
+    blog_cutoff = now - BLOG_RETENTION_DAYS * 86400
 
     blog_urls = state.get("notified_blog_urls", {})
-    state["notified_blog_urls"] = {
-        url: ts for url, ts in blog_urls.items()
-        if ts > blog_cutoff_iso
-    }
+    _delete_keys(blog_urls, [url for url, ts in blog_urls.items() if ts <= blog_cutoff])
 
     arxiv_map = state.get("blog_arxiv_map", {})
-    state["blog_arxiv_map"] = {
-        aid: info for aid, info in arxiv_map.items()
-        if info.get("added_at", "") > blog_cutoff_iso
-    }
+    _delete_keys(arxiv_map, [
+        aid for aid, info in arxiv_map.items()
+        if info[_ADDED_AT] <= blog_cutoff
+    ])
+
+    # Drop validators of feeds removed from the config
+    validators = state.get("feed_validators", {})
+    _delete_keys(validators, [url for url in validators if url not in _FEED_URLS])
 
     # Prune old daily buffer entries
-    _prune_buffer(state)
+    _prune_buffer(state, now)
 
 
-def _prune_buffer(state: dict[str, Any]) -> None:
-    """Remove daily_buffer entries older than BUFFER_RETENTION_DAYS."""
+def _prune_buffer(state: dict[str, Any], now: int) -> None:
+    """Remove daily_buffer entries older than BUFFER_RETENTION_DAYS.
+
+    ``now`` is the caller's epoch-seconds clock reading, so one prune pass
+    uses a single point in time for every retention window.
+    """
     buf = state.get("daily_buffer", {})
-    cutoff = (datetime.now(JST) - timedelta(days=BUFFER_RETENTION_DAYS)).strftime("%Y-%m-%d")
-    state["daily_buffer"] = {
-        date_key: day for date_key, day in buf.items()
-        if date_key >= cutoff
-    }
+    if not buf:
+        return  # the usual case right after ack_buffer
+    cutoff_dt = datetime.fromtimestamp(now, JST) - timedelta(days=BUFFER_RETENTION_DAYS)
+    cutoff = cutoff_dt.date().isoformat()
+    if min(buf) >= cutoff:
+        return
+    _delete_keys(buf, [date_key for date_key in buf if date_key < cutoff])
 
 
 # --- arXiv paper state ---
@@ -116,19 +237,34 @@ def _prune_buffer(state: dict[str, Any]) -> None:
 def filter_new_papers(
     papers: list[dict[str, Any]], state: dict[str, Any]
 ) -> list[dict[str, Any]]:
-    """Return only papers whose arXiv ID is not in the notified set."""
-    seen = set(state.get("notified_ids", {}).keys())
-    return [p for p in papers if p["arxiv_id"] not in seen]
+    """Return only papers whose arXiv ID is not in the notified set.
+
+    Duplicate IDs within ``papers`` are collapsed to their first occurrence,
+    in order of first appearance.
+    """
+    seen = state.get("notified_ids", {})
+    # Probe the notified dict per item (O(batch), independent of history size)
+    out: dict[str, dict[str, Any]] = {}
+    for p in papers:
+        aid = p["arxiv_id"]
+        if aid not in seen:
+            out.setdefault(aid, p)
+    return list(out.values())
 
 
 def mark_notified(state: dict[str, Any], arxiv_ids: list[str]) -> None:
-    """Add arXiv IDs to the notified set with current timestamp, then prune."""
-    now = datetime.now(timezone.utc).isoformat()
-    ids = state.get("notified_ids", {})
+    """Add arXiv IDs to the notified set with current timestamp.
+
+    The set is capped at MAX_NOTIFIED_IDS; dicts keep insertion order, so the
+    oldest IDs are evicted first without waiting for the time-based prune.
+    """
+    now = int(time.time())
+    ids = state.setdefault("notified_ids", {})
     for aid in arxiv_ids:
         ids[aid] = now
-    state["notified_ids"] = ids
-    _prune_old_ids(state)
+    excess = len(ids) - MAX_NOTIFIED_IDS
+    if excess > 0:
+        _delete_keys(ids, list(islice(ids, excess)))
 
 
 # --- Blog state ---
@@ -137,7 +273,7 @@ def filter_new_blog_posts(
     posts: list[dict[str, Any]], state: dict[str, Any]
 ) -> list[dict[str, Any]]:
     """Return only blog posts whose URL is not in the notified set."""
-    seen = set(state.get("notified_blog_urls", {}).keys())
+    seen = state.get("notified_blog_urls", {})
     return [p for p in posts if p["url"] not in seen]
 
 
@@ -146,26 +282,32 @@ def mark_blog_notified(
     posts: list[dict[str, Any]],
 ) -> None:
     """Record blog URLs as notified and save arXiv ID mappings from posts."""
-    now = datetime.now(timezone.utc).isoformat()
+    now = int(time.time())
     blog_urls = state.setdefault("notified_blog_urls", {})
     arxiv_map = state.setdefault("blog_arxiv_map", {})
 
     for post in posts:
-        blog_urls[post["url"]] = now
-        for aid in post.get("arxiv_ids", []):
-            arxiv_map[aid] = {
-                "blog_url": post["url"],
-                "blog_title": post.get("title", ""),
-                "blog_source": post.get("source", ""),
-                "added_at": now,
-            }
+        url = post["url"]
+        blog_urls[url] = now
+        arxiv_ids = post.get("arxiv_ids")
+        if arxiv_ids:
+            title = post.get("title", "")
+            source = post.get("source", "")
+            for aid in arxiv_ids:
+                arxiv_map[aid] = [url, title, source, now]
 
 
 def lookup_blog_for_arxiv(
     state: dict[str, Any], arxiv_id: str
 ) -> dict[str, Any] | None:
-    """Return blog info dict if an arXiv ID is linked to a blog post."""
-    return state.get("blog_arxiv_map", {}).get(arxiv_id)
+    """Return blog info dict if an arXiv ID is linked to a blog post.
+
+    The dict has keys blog_url, blog_title, blog_source and added_at.
+    """
+    entry = state.get("blog_arxiv_map", {}).get(arxiv_id)
+    if entry is None:
+        return None
+    return dict(zip(_BLOG_INFO_FIELDS, entry))
 
 
 def mark_blog_arxiv_linked(state: dict[str, Any], arxiv_id: str) -> None:
@@ -177,35 +319,20 @@ def mark_blog_arxiv_linked(state: dict[str, Any], arxiv_id: str) -> None:
 
 def buffer_blog_posts(state: dict[str, Any], posts: list[dict[str, Any]]) -> None:
     """Append blog posts to today's daily buffer, deduplicating by URL."""
-    today = _today_jst()
-    _ensure_buffer_day(state, today)
-    existing = {p["url"] for p in state["daily_buffer"][today]["blog_posts"]}
-    for post in posts:
-        if post["url"] not in existing:
-            state["daily_buffer"][today]["blog_posts"].append(post)
-            existing.add(post["url"])
+    day = _ensure_buffer_day(state, today_jst())
+    _append_unique(day["blog_posts"], posts, _URL_KEY)
 
 
 def buffer_safety_posts(state: dict[str, Any], posts: list[dict[str, Any]]) -> None:
     """Append safety blog posts to today's daily buffer, deduplicating by URL."""
-    today = _today_jst()
-    _ensure_buffer_day(state, today)
-    existing = {p["url"] for p in state["daily_buffer"][today]["safety_posts"]}
-    for post in posts:
-        if post["url"] not in existing:
-            state["daily_buffer"][today]["safety_posts"].append(post)
-            existing.add(post["url"])
+    day = _ensure_buffer_day(state, today_jst())
+    _append_unique(day["safety_posts"], posts, _URL_KEY)
 
 
 def buffer_arxiv_papers(state: dict[str, Any], papers: list[dict[str, Any]]) -> None:
     """Append keyword-matched arXiv papers to today's buffer, deduplicating by ID."""
-    today = _today_jst()
-    _ensure_buffer_day(state, today)
-    existing = {p["arxiv_id"] for p in state["daily_buffer"][today]["arxiv_papers"]}
-    for paper in papers:
-        if paper["arxiv_id"] not in existing:
-            state["daily_buffer"][today]["arxiv_papers"].append(paper)
-            existing.add(paper["arxiv_id"])
+    day = _ensure_buffer_day(state, today_jst())
+    _append_unique(day["arxiv_papers"], papers, _ARXIV_ID_KEY)
 
 
 def buffer_linked_papers(
@@ -216,42 +343,21 @@ def buffer_linked_papers(
 
     Each item should have keys: "paper" (arXiv paper dict) and "blog_info" (blog info dict).
     """
-    today = _today_jst()
-    _ensure_buffer_day(state, today)
-    existing = {
-        it["paper"]["arxiv_id"]
-        for it in state["daily_buffer"][today]["linked_papers"]
-    }
-    for item in items:
-        aid = item["paper"]["arxiv_id"]
-        if aid not in existing:
-            state["daily_buffer"][today]["linked_papers"].append(item)
-            existing.add(aid)
+    day = _ensure_buffer_day(state, today_jst())
+    _append_unique(day["linked_papers"], items, _linked_key)
 
 
 def peek_buffer(state: dict[str, Any]) -> dict[str, list[Any]]:
     """Aggregate all buffered items across all dates WITHOUT clearing the buffer.
 
-    Returns dict with keys: blog_posts, arxiv_papers, linked_papers.
+    Returns dict with keys: blog_posts, arxiv_papers, linked_papers, safety_posts,
+    each listing items oldest day first.
     """
     buf = state.get("daily_buffer", {})
-    all_blog: list[dict[str, Any]] = []
-    all_arxiv: list[dict[str, Any]] = []
-    all_linked: list[dict[str, Any]] = []
-    all_safety: list[dict[str, Any]] = []
-
-    for date_key in sorted(buf.keys()):
-        day = buf[date_key]
-        all_blog.extend(day.get("blog_posts", []))
-        all_arxiv.extend(day.get("arxiv_papers", []))
-        all_linked.extend(day.get("linked_papers", []))
-        all_safety.extend(day.get("safety_posts", []))
-
+    days = [buf[date_key] for date_key in sorted(buf)]
     return {
-        "blog_posts": all_blog,
-        "arxiv_papers": all_arxiv,
-        "linked_papers": all_linked,
-        "safety_posts": all_safety,
+        key: list(chain.from_iterable(day.get(key, ()) for day in days))
+        for key in _EMPTY_DAY
     }
 
 